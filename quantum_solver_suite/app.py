@@ -9,7 +9,10 @@ matplotlib.use('Agg')  # Use non-interactive backend
 import io
 import base64
 from datetime import datetime
+import functools
 import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 # Import all solvers
 from solvers.finite_well import FiniteWellSolver
@@ -65,6 +68,28 @@ SOLVERS = {
     }
 }
 
+# Solvers are stateless, so build each one (and its static metadata) once
+SOLVER_INSTANCES = {k: v['class']() for k, v in SOLVERS.items()}
+PARAMS = {k: s.get_parameters() for k, s in SOLVER_INSTANCES.items()}
+EXAMPLES = {k: s.get_examples() for k, s in SOLVER_INSTANCES.items()}
+
+# Largest number of parameter sets accepted by one /api/solve_batch request
+MAX_BATCH_SIZE = 100
+
+# Worker processes that solve and render, so concurrent requests are not serialized
+# on one interpreter's GIL and pyplot lock (each worker keeps its own figure cache).
+# Workers are spawned rather than forked, since they start from request threads
+RENDER_POOL = ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1),
+                                  mp_context=multiprocessing.get_context('spawn'),
+                                  initializer=matplotlib.use, initargs=('Agg',))
+
+@functools.lru_cache(maxsize=256)
+def _cached_solve(solver_id, params_json):
+    """Solve and plot once per distinct (solver, parameters) pair"""
+    params = json.loads(params_json)
+    solver = SOLVER_INSTANCES[solver_id]
+    return RENDER_POOL.submit(solver.solve_and_plot, params).result()
+
 @app.route('/')
 def index():
     return render_template('index.html', solvers=SOLVERS)
@@ -75,13 +100,12 @@ def solver_page(solver_id):
         return render_template('404.html'), 404
     
     solver_info = SOLVERS[solver_id]
-    solver_instance = solver_info['class']()
     
     return render_template('solver.html', 
                          solver_id=solver_id,
                          solver_info=solver_info,
-                         parameters=solver_instance.get_parameters(),
-                         examples=solver_instance.get_examples())
+                         parameters=PARAMS[solver_id],
+                         examples=EXAMPLES[solver_id])
 
 @app.route('/api/solve/<solver_id>', methods=['POST'])
 def solve_problem(solver_id):
@@ -90,22 +114,21 @@ def solve_problem(solver_id):
             return jsonify({'error': 'Invalid solver'}), 400
         
         # Get parameters from request
-        params = request.json
+        params = request.get_json(silent=True)
+        if not isinstance(params, dict):
+            return jsonify({'error': 'Expected a parameter object'}), 400
         
-        # Create solver instance and solve
-        solver_class = SOLVERS[solver_id]['class']
-        solver = solver_class()
+        # Look up the shared solver instance
+        solver = SOLVER_INSTANCES[solver_id]
         
         # Validate parameters
         validation = solver.validate_parameters(params)
         if not validation['valid']:
             return jsonify({'error': validation['message']}), 400
         
-        # Solve the problem
-        results = solver.solve(params)
-        
-        # Generate plot
-        plot_data = solver.generate_plot(params, results)
+        # Solve the problem and generate plot from the validated values,
+        # reusing earlier identical requests
+        results, plot_data = _cached_solve(solver_id, json.dumps(validation['params'], sort_keys=True))
         
         return jsonify({
             'success': True,
@@ -117,15 +140,50 @@ def solve_problem(solver_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/solve_batch/<solver_id>', methods=['POST'])
+def solve_batch(solver_id):
+    try:
+        if solver_id not in SOLVERS:
+            return jsonify({'error': 'Invalid solver'}), 400
+        
+        # Get the list of parameter sets from request
+        param_list = request.get_json(silent=True)
+        if not isinstance(param_list, list):
+            return jsonify({'error': 'Expected a list of parameter sets'}), 400
+        if len(param_list) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'At most {MAX_BATCH_SIZE} parameter sets per batch'}), 400
+        
+        solver = SOLVER_INSTANCES[solver_id]
+        
+        # Validate every parameter set before solving any of them
+        validated = []
+        for i, params in enumerate(param_list):
+            if not isinstance(params, dict):
+                return jsonify({'error': f"Parameter set {i}: Expected a parameter object"}), 400
+            validation = solver.validate_parameters(params)
+            if not validation['valid']:
+                return jsonify({'error': f"Parameter set {i}: {validation['message']}"}), 400
+            validated.append(validation['params'])
+        
+        # Solve all problems at once (no plots)
+        results = solver.solve_batch(validated)
+        
+        return jsonify({
+            'success': True,
+            'results': results,
+            'timestamp': datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/example/<solver_id>/<example_id>')
 def get_example(solver_id, example_id):
     try:
         if solver_id not in SOLVERS:
             return jsonify({'error': 'Invalid solver'}), 400
         
-        solver_class = SOLVERS[solver_id]['class']
-        solver = solver_class()
-        examples = solver.get_examples()
+        examples = EXAMPLES[solver_id]
         
         if example_id not in examples:
             return jsonify({'error': 'Invalid example'}), 400
@@ -1,8 +1,53 @@
 from abc import ABC, abstractmethod
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import io
-import base64
+import threading
+
+try:
+    import pybase64  # SIMD-accelerated base64
+    b64encode_str = pybase64.b64encode_as_string
+except ImportError:
+    import base64
+    
+    def b64encode_str(data):
+        """Base64-encode a bytes-like object straight to str"""
+        return base64.b64encode(data).decode('ascii')
+
+IMAGE_MIME_TYPES = {
+    'svg': 'image/svg+xml',
+    'png': 'image/png'
+}
+
+# Accepted spellings of a bool parameter (JSON booleans, form or query-string values)
+_BOOL_STRINGS = {'true': True, '1': True, 'yes': True, 'on': True,
+                 'false': False, '0': False, 'no': False, 'off': False}
+
+def parse_bool(value):
+    """Coerce a bool parameter like float() does numbers, raising ValueError if unrecognised"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in _BOOL_STRINGS:
+        return _BOOL_STRINGS[value.strip().lower()]
+    raise ValueError(f'Invalid boolean value: {value!r}')
+
+# viridis colors for n evenly spaced levels, precomputed for every supported n
+VIRIDIS_COLORS = {n: plt.cm.viridis(np.linspace(0, 1, n)) for n in range(1, 22)}
+
+# Drop curve vertices that deviate < 0.3 px from the simplified path (default 1/9),
+# which keeps sampled curves smooth but trims path data
+plt.rcParams['path.simplify_threshold'] = 0.3
+
+# Figures reused between plots, keyed by layout, one cache per process (so one per
+# render pool worker in the app). They are plain Agg figures outside pyplot's
+# registry; a cached figure is shared, so plots are only drawn while holding
+# _PLOT_LOCK (see BaseSolver.plot)
+_FIG_CACHE = {}
+_PLOT_LOCK = threading.Lock()
 
 class BaseSolver(ABC):
     """Base class for all quantum mechanics solvers"""
@@ -18,7 +63,7 @@ class BaseSolver(ABC):
     
     @abstractmethod
     def validate_parameters(self, params):
-        """Validate input parameters"""
+        """Validate input parameters, returning the coerced values under 'params'"""
         pass
     
     @abstractmethod
@@ -26,6 +71,10 @@ class BaseSolver(ABC):
         """Solve the quantum mechanics problem"""
         pass
     
+    def solve_batch(self, param_list):
+        """Solve several parameter sets, returning one result per set"""
+        return [self.solve(params) for params in param_list]
+    
     @abstractmethod
     def generate_plot(self, params, results):
         """Generate visualization plot"""
@@ -36,11 +85,41 @@ class BaseSolver(ABC):
         """Return example parameter sets"""
         pass
     
-    def plot_to_base64(self, fig):
-        """Convert matplotlib figure to base64 string"""
+    def plot(self, params, results):
+        """Thread-safe generate_plot, serialized on the process-wide figure cache lock"""
+        with _PLOT_LOCK:
+            return self.generate_plot(params, results)
+    
+    def solve_and_plot(self, params):
+        """Return (results, plot) for validated params, the unit of work run in a render worker"""
+        results = self.solve(params)
+        return results, self.plot(params, results)
+    
+    def get_figure(self, nrows=1, ncols=1, figsize=None):
+        """Return (fig, axes) like plt.subplots, reusing a cleared figure of the same layout"""
+        key = (nrows, ncols, figsize)
+        cached = _FIG_CACHE.get(key)
+        if cached is None:
+            # Bypass pyplot: nothing to register, close or make current
+            fig = Figure(figsize=figsize)
+            FigureCanvasAgg(fig)
+            cached = _FIG_CACHE[key] = fig, fig.subplots(nrows, ncols)
+        else:
+            fig, axes = cached
+            for ax in np.atleast_1d(axes).flat:
+                ax.clear()
+            # tight_layout leaves a placeholder layout engine behind (matplotlib < 3.8
+            # warns "layout has changed to tight" about it) and starts from the
+            # current layout, so drop the engine and restore the default margins
+            fig.set_layout_engine(None)
+            fig.subplots_adjust(**{k: plt.rcParams[f'figure.subplot.{k}'] for k in
+                                   ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')})
+        return cached
+    
+    def plot_to_base64(self, fig, format='svg'):
+        """Convert matplotlib figure to base64 data URL ('svg' or 'png')"""
         img_buffer = io.BytesIO()
-        fig.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
-        img_buffer.seek(0)
-        img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-        plt.close(fig)
-        return f"data:image/png;base64,{img_base64}"
+        fig.savefig(img_buffer, format=format, dpi=96, bbox_inches=None, pad_inches=0)
+        # getbuffer() is a zero-copy view, encoded directly to the output string
+        img_base64 = b64encode_str(img_buffer.getbuffer())
+        return f"data:{IMAGE_MIME_TYPES[format]};base64,{img_base64}"
@@ -1,9 +1,27 @@
 from . import BaseSolver
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.optimize import fsolve
+from scipy.optimize import brentq
+import math
+
+
+def _phase_residual(z, a, z0, j):
+    """Phase za - 2 arctan(κ/z) minus jπ, zero at the j-th bound state"""
+    # tan(za) = 2√((z₀/z)² - 1)/(2 - (z₀/z)²) is tan(za) = tan(2 arctan(κ/z))
+    # with κ = √(z₀² - z²), so its roots are where the phase is a multiple of π.
+    # The phase increases monotonically from -π at z = 0 to z₀a at z = z₀.
+    kappa = math.sqrt(max(z0 * z0 - z * z, 0.0))
+    return z * a - 2 * math.atan2(kappa, z) - j * math.pi
+
 
 class FiniteWellSolver(BaseSolver):
+    # Normalized plot grid; float32 is plenty for drawing and halves memory traffic
+    _GRID = np.linspace(0.0, 1.0, 1000, dtype=np.float32)
+    
+    # One bound state per π of z₀a, so this bounds the root finding and the response size
+    MAX_STATES = 50
+    # Bound states named in the plot legend (the rest are marked but not labelled)
+    LEGEND_STATES = 8
+    
     def __init__(self):
         super().__init__()
         self.name = "Finite Square Well"
@@ -66,68 +84,46 @@ class FiniteWellSolver(BaseSolver):
             hbar = float(params.get('hbar', 1.0))
             precision = int(params.get('precision', 7))
             
+            if not all(math.isfinite(x) for x in [a, V0, m, hbar]):
+                return {'valid': False, 'message': 'All physical parameters must be finite!'}
+            
             if any(x <= 0 for x in [a, V0, m, hbar]):
                 return {'valid': False, 'message': 'All physical parameters must be positive!'}
             
+            # Number of bound states is ⌈z₀a/π⌉
+            if math.sqrt(2 * m * V0) / hbar * a / math.pi > self.MAX_STATES:
+                return {'valid': False,
+                        'message': f'Too many bound states (more than {self.MAX_STATES})! '
+                                   'Reduce a, V₀ or m, or increase ℏ.'}
+            
             if precision < 1 or precision > 15:
                 return {'valid': False, 'message': 'Precision must be between 1 and 15!'}
                 
-            return {'valid': True, 'message': 'Parameters valid'}
+            return {'valid': True, 'message': 'Parameters valid',
+                    'params': {'a': a, 'V0': V0, 'm': m, 'hbar': hbar, 'precision': precision}}
             
         except (ValueError, TypeError):
             return {'valid': False, 'message': 'Invalid parameter values!'}
     
     def solve(self, params):
-        a = float(params['a'])
-        V0 = float(params['V0'])
-        m = float(params['m'])
-        hbar = float(params['hbar'])
-        precision = int(params['precision'])
+        a = params['a']
+        V0 = params['V0']
+        m = params['m']
+        hbar = params['hbar']
+        precision = params['precision']
         
         # Calculate z0
         z0 = np.sqrt(2 * m * V0 / hbar**2)
         
-        def transcendental_equation(z):
-            if z <= 1e-8 or z >= z0 - 1e-8:
-                return 1000
-            try:
-                ratio = z0 / z
-                ratio_squared = ratio**2
-                if ratio_squared <= 1.01:
-                    return 1000
-                numerator = 2 * np.sqrt(ratio_squared - 1)
-                denominator = 2 - ratio_squared
-                if abs(denominator) < 1e-12:
-                    return 1000
-                rhs = numerator / denominator
-                lhs = np.tan(z * a)
-                return lhs - rhs
-            except:
-                return 1000
-        
-        # Find solutions using multiple starting points
-        start_points = np.linspace(0.2, z0 - 0.2, 20)
+        # Since za - π < phase < za, state j is the single root in the branch
+        # (jπ/a, (j+1)π/a) ∩ (0, z₀), so the solutions come out in order
         solutions = []
-        
-        for z_start in start_points:
-            try:
-                z_sol = fsolve(transcendental_equation, z_start)[0]
-                if (0.01 < z_sol < z0 - 0.01 and 
-                    abs(transcendental_equation(z_sol)) < 1e-10):
-                    # Check if new solution
-                    is_new = True
-                    for existing_z, _ in solutions:
-                        if abs(z_sol - existing_z) < 1e-10:
-                            is_new = False
-                            break
-                    if is_new:
-                        energy = -(z0**2 - z_sol**2) * hbar**2 / (2 * m)
-                        solutions.append((z_sol, energy))
-            except:
-                continue
-        
-        # Sort by energy (most bound first)
-        solutions.sort(key=lambda x: x[1])
+        for j in range(int(np.ceil(z0 * a / np.pi))):
+            lower = j * np.pi / a
+            upper = min((j + 1) * np.pi / a, z0)
+            z_sol = brentq(_phase_residual, lower, upper, args=(a, z0, j), xtol=1e-12)
+            energy = -(z0**2 - z_sol**2) * hbar**2 / (2 * m)
+            solutions.append((z_sol, energy))
         
         # Format results
         formatted_solutions = []
@@ -155,56 +151,51 @@ class FiniteWellSolver(BaseSolver):
         }
     
     def generate_plot(self, params, results):
-        a = float(params['a'])
-        V0 = float(params['V0'])
-        m = float(params['m'])
-        hbar = float(params['hbar'])
+        a = params['a']
+        V0 = params['V0']
+        m = params['m']
+        hbar = params['hbar']
         
-        z0 = np.sqrt(2 * m * V0 / hbar**2)
-        z_range = np.linspace(0.01, z0 - 0.01, 1000)
+        # Python float scalars keep the float32 grid from being promoted
+        z0 = math.sqrt(2 * m * V0 / hbar**2)
+        z_range = 0.01 + (z0 - 0.02) * self._GRID
         
         # Calculate function values
-        lhs_values = []
-        rhs_values = []
+        ratio_squared = (z0 / z_range)**2
+        denominator = 2 - ratio_squared
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rhs_values = np.where((ratio_squared > 1) & (np.abs(denominator) > 1e-12),
+                                  2 * np.sqrt(np.maximum(ratio_squared - 1, 0)) / denominator,
+                                  np.nan)
+        lhs_values = np.tan(z_range * a)
         
-        for z in z_range:
-            try:
-                lhs = np.tan(z * a)
-                ratio = z0 / z
-                ratio_squared = ratio**2
-                if ratio_squared > 1:
-                    numerator = 2 * np.sqrt(ratio_squared - 1)
-                    denominator = 2 - ratio_squared
-                    if abs(denominator) > 1e-12:
-                        rhs = numerator / denominator
-                    else:
-                        rhs = np.nan
-                else:
-                    rhs = np.nan
-                
-                lhs_values.append(lhs if abs(lhs) < 50 else np.nan)
-                rhs_values.append(rhs if abs(rhs) < 50 else np.nan)
-            except:
-                lhs_values.append(np.nan)
-                rhs_values.append(np.nan)
+        # Hide the asymptotes
+        lhs_values[np.abs(lhs_values) >= 50] = np.nan
+        rhs_values[np.abs(rhs_values) >= 50] = np.nan
         
         # Create plot
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = self.get_figure(figsize=(10, 6))
         ax.plot(z_range, lhs_values, 'b-', linewidth=2, label=f'tan({a}z)')
         ax.plot(z_range, rhs_values, 'r-', linewidth=2, 
                 label='2√((z₀/z)² - 1)/(2 - (z₀/z)²)')
         
         # Mark solutions
         if results['has_solutions']:
-            for state in results['bound_states']:
+            states = results['bound_states']
+            for state in states[:self.LEGEND_STATES]:
                 z_val = state['z_value']
-                try:
-                    y_val = np.tan(z_val * a)
-                    if abs(y_val) < 50:
-                        ax.plot(z_val, y_val, 'go', markersize=8, 
-                               label=f'State {state["state_number"]}: z={z_val:.4f}')
-                except:
-                    pass
+                y_val = np.tan(z_val * a)
+                if abs(y_val) < 50:
+                    ax.plot(z_val, y_val, 'go', markersize=8, 
+                           label=f'State {state["state_number"]}: z={z_val:.4f}')
+            
+            # Remaining states are drawn as one marker series with a single legend entry
+            rest = states[self.LEGEND_STATES:]
+            if rest:
+                z_rest = np.array([state['z_value'] for state in rest])
+                y_rest = np.tan(z_rest * a)
+                y_rest[np.abs(y_rest) >= 50] = np.nan
+                ax.plot(z_rest, y_rest, 'go', markersize=8, label=f'+{len(rest)} more states')
         
         ax.set_xlim(0, z0)
         ax.set_ylim(-20, 20)
@@ -215,7 +206,7 @@ class FiniteWellSolver(BaseSolver):
         ax.grid(True, alpha=0.3)
         ax.axhline(y=0, color='k', linestyle='--', alpha=0.5)
         
-        plt.tight_layout()
+        fig.tight_layout()
         return self.plot_to_base64(fig)
     
     def get_examples(self):
@@ -237,7 +228,7 @@ class FiniteWellSolver(BaseSolver):
             },
             'shallow_well': {
                 'name': 'Shallow Well',
-                'description': 'Very shallow well (may have no bound states)',
+                'description': 'Very shallow well with a single weakly bound state',
                 'parameters': {'a': 1.0, 'V0': 0.2, 'm': 0.5, 'hbar': 1.0, 'precision': 7}
             }
         }
@@ -1,10 +1,49 @@
-from . import BaseSolver
+from . import BaseSolver, VIRIDIS_COLORS
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.special import hermite
-from scipy.special import factorial
+import math
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _hermite_table(xi, max_n):
+    """Physicists' Hermite polynomials H_0..H_max_n evaluated at xi"""
+    H = np.empty((max_n + 1, xi.size))
+    H[0] = 1
+    if max_n > 0:
+        H[1] = 2 * xi
+    for n in range(1, max_n):
+        H[n + 1] = 2 * xi * H[n] - 2 * n * H[n - 1]
+    return H
+
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _hermite_kernel(xi, max_n):
+        """JIT-compiled _hermite_table, each x point runs its own recurrence"""
+        H = np.empty((max_n + 1, xi.size))
+        for j in range(xi.size):
+            two_xi = 2.0 * xi[j]
+            h_prev = 1.0
+            h = two_xi
+            H[0, j] = h_prev
+            if max_n > 0:
+                H[1, j] = h
+            for n in range(1, max_n):
+                h_prev, h = h, two_xi * h - 2.0 * n * h_prev
+                H[n + 1, j] = h
+        return H
+else:
+    _hermite_kernel = _hermite_table
+
 
 class HarmonicOscillatorSolver(BaseSolver):
+    # n! and Hermite normalization 1/√(2ⁿ n!) for every supported n (max_n ≤ 20)
+    _FACT = np.array([math.factorial(n) for n in range(21)], dtype=float)
+    _HERM_NORM = 1.0 / np.sqrt(2.0**np.arange(21) * _FACT)
+    
     def __init__(self):
         super().__init__()
         self.name = "Quantum Harmonic Oscillator"
@@ -73,81 +112,97 @@ class HarmonicOscillatorSolver(BaseSolver):
             if max_n > 20:
                 return {'valid': False, 'message': 'Maximum n should not exceed 20!'}
                 
-            return {'valid': True, 'message': 'Parameters valid'}
+            return {'valid': True, 'message': 'Parameters valid',
+                    'params': {'omega': omega, 'm': m, 'hbar': hbar, 'max_n': max_n, 'x_range': x_range}}
             
         except (ValueError, TypeError):
             return {'valid': False, 'message': 'Invalid parameter values!'}
     
     def solve(self, params):
-        omega = float(params['omega'])
-        m = float(params['m'])
-        hbar = float(params['hbar'])
-        max_n = int(params['max_n'])
+        return self.solve_batch([params])[0]
+    
+    def solve_batch(self, param_list):
+        """Solve several oscillators at once with broadcast array operations"""
+        omega = np.array([p['omega'] for p in param_list])
+        m = np.array([p['m'] for p in param_list])
+        hbar = np.array([p['hbar'] for p in param_list])
+        max_n = [p['max_n'] for p in param_list]
         
         # Characteristic length
         x0 = np.sqrt(hbar / (m * omega))
         
-        # Energy levels
-        energy_levels = []
-        for n in range(max_n + 1):
-            energy = hbar * omega * (n + 0.5)
-            energy_levels.append({
-                'n': n,
-                'energy': round(energy, 6),
-                'classical_turning_points': round(np.sqrt(2 * energy / (m * omega**2)), 4)
-            })
+        # Energy levels up to the largest requested n, one row per oscillator
+        n_values = np.arange(max(max_n, default=0) + 1)
+        energies = (hbar * omega)[:, None] * (n_values + 0.5)
+        turning_points = np.sqrt(2 * energies / (m * omega**2)[:, None])
         
         # Zero-point energy
         zero_point = hbar * omega / 2
         
-        return {
-            'system_info': {
-                'characteristic_length': round(x0, 6),
-                'zero_point_energy': round(zero_point, 6),
-                'energy_spacing': round(hbar * omega, 6),
-                'classical_frequency': round(omega / (2 * np.pi), 6)
-            },
-            'energy_levels': energy_levels
-        }
+        results = []
+        for i, n_max in enumerate(max_n):
+            energy_levels = [{
+                'n': n,
+                'energy': round(energies[i, n], 6),
+                'classical_turning_points': round(turning_points[i, n], 4)
+            } for n in range(n_max + 1)]
+            
+            results.append({
+                'system_info': {
+                    'characteristic_length': round(x0[i], 6),
+                    'zero_point_energy': round(zero_point[i], 6),
+                    'energy_spacing': round(hbar[i] * omega[i], 6),
+                    'classical_frequency': round(omega[i] / (2 * np.pi), 6)
+                },
+                'energy_levels': energy_levels
+            })
+        
+        return results
     
     def generate_plot(self, params, results):
-        omega = float(params['omega'])
-        m = float(params['m'])
-        hbar = float(params['hbar'])
-        max_n = int(params['max_n'])
-        x_range = float(params['x_range'])
+        omega = params['omega']
+        m = params['m']
+        hbar = params['hbar']
+        max_n = params['max_n']
+        x_range = params['x_range']
         
         x0 = np.sqrt(hbar / (m * omega))
         x = np.linspace(-x_range, x_range, 1000)
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+        # Normalized wavefunctions for every level, one row per n
+        xi = x / x0
+        xi_squared = xi**2
+        gauss = np.exp(-0.5 * xi_squared)
+        prefactor = (m * omega / (np.pi * hbar))**0.25
+        levels = np.arange(max_n + 1)
+        norm = prefactor * self._HERM_NORM[:max_n + 1]
+        psi = norm[:, None] * gauss * _hermite_kernel(xi, max_n)
+        
+        # Wavefunctions scaled and shifted to their energy levels for display
+        energies = hbar * omega * (levels + 0.5)
+        psi_scaled = energies[:, None] + psi * (hbar * omega * 0.3)
+        
+        fig, (ax1, ax2) = self.get_figure(1, 2, figsize=(15, 6))
         
         # Plot 1: Energy levels
         ax1.axhline(y=0, color='k', linestyle='-', alpha=0.3)
         
-        # Potential
-        V = 0.5 * m * omega**2 * x**2
+        # Potential (½mω²x² = ½ℏωξ²)
+        V = 0.5 * hbar * omega * xi_squared
         ax1.plot(x, V, 'k-', linewidth=2, label='Potential V(x)')
         
         # Energy levels and wavefunctions
-        colors = plt.cm.viridis(np.linspace(0, 1, max_n + 1))
+        colors = VIRIDIS_COLORS[max_n + 1]
         
         for n in range(max_n + 1):
-            energy = hbar * omega * (n + 0.5)
+            energy = energies[n]
             
             # Energy line
             ax1.axhline(y=energy, color=colors[n], linestyle='--', alpha=0.7)
             ax1.text(x_range * 0.8, energy, f'n={n}', color=colors[n], fontweight='bold')
             
-            # Wavefunction (normalized)
-            xi = x / x0
-            H_n = hermite(n)
-            psi = (1 / (2**n * factorial(n))**0.5) * (m * omega / (np.pi * hbar))**(1/4) * \
-                  np.exp(-m * omega * x**2 / (2 * hbar)) * H_n(xi)
-            
-            # Scale and shift wavefunction for display
-            psi_scaled = energy + psi * hbar * omega * 0.3
-            ax1.plot(x, psi_scaled, color=colors[n], linewidth=2, alpha=0.8)
+            # Wavefunction
+            ax1.plot(x, psi_scaled[n], color=colors[n], linewidth=2, alpha=0.8)
         
         ax1.set_xlim(-x_range, x_range)
         ax1.set_ylim(0, hbar * omega * (max_n + 2))
@@ -159,12 +214,7 @@ class HarmonicOscillatorSolver(BaseSolver):
         
         # Plot 2: Probability densities
         for n in range(min(4, max_n + 1)):  # Show only first 4 levels
-            xi = x / x0
-            H_n = hermite(n)
-            psi = (1 / (2**n * factorial(n))**0.5) * (m * omega / (np.pi * hbar))**(1/4) * \
-                  np.exp(-m * omega * x**2 / (2 * hbar)) * H_n(xi)
-            
-            prob_density = psi**2
+            prob_density = psi[n]**2
             ax2.plot(x, prob_density, color=colors[n], linewidth=2, 
                     label=f'|ψ_{n}(x)|²', alpha=0.8)
         
@@ -175,7 +225,7 @@ class HarmonicOscillatorSolver(BaseSolver):
         ax2.legend()
         ax2.grid(True, alpha=0.3)
         
-        plt.tight_layout()
+        fig.tight_layout()
         return self.plot_to_base64(fig)
     
     def get_examples(self):
@@ -1,7 +1,54 @@
-from . import BaseSolver
+from . import BaseSolver, VIRIDIS_COLORS
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.special import assoc_laguerre, factorial  # Updated import
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# 0! through 20!, enough for n + l at any supported n
+_FACTORIALS = np.cumprod(np.concatenate(([1.0], np.arange(1.0, 21.0))))
+
+# Closed-form radial wavefunctions for the s orbitals shown in the plot
+_R_ANALYTIC = {
+    (1, 0): lambda r, Z, a0: 2 * (Z / a0)**1.5 * np.exp(-Z * r / a0),
+    (2, 0): lambda r, Z, a0: ((Z / a0)**1.5 / (2 * np.sqrt(2)) *
+                              (2 - Z * r / a0) * np.exp(-Z * r / (2 * a0))),
+    (3, 0): lambda r, Z, a0: (2 * (Z / (3 * a0))**1.5 *
+                              (1 - 2 * Z * r / (3 * a0) + 2 * (Z * r / a0)**2 / 27) *
+                              np.exp(-Z * r / (3 * a0))),
+}
+
+
+def _laguerre_table(rho, kmax, alpha):
+    """Generalized Laguerre polynomials L^alpha_0..L^alpha_kmax evaluated at rho"""
+    L = np.empty((kmax + 1, rho.size))
+    L[0] = 1
+    if kmax > 0:
+        L[1] = 1 + alpha - rho
+    for k in range(1, kmax):
+        L[k + 1] = ((2 * k + 1 + alpha - rho) * L[k] - (k + alpha) * L[k - 1]) / (k + 1)
+    return L
+
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _laguerre_kernel(rho, kmax, alpha):
+        """JIT-compiled _laguerre_table, each rho point runs its own recurrence"""
+        L = np.empty((kmax + 1, rho.size))
+        for j in range(rho.size):
+            l_prev = 1.0
+            l = 1.0 + alpha - rho[j]
+            L[0, j] = l_prev
+            if kmax > 0:
+                L[1, j] = l
+            for k in range(1, kmax):
+                l_prev, l = l, ((2 * k + 1 + alpha - rho[j]) * l - (k + alpha) * l_prev) / (k + 1)
+                L[k + 1, j] = l
+        return L
+else:
+    _laguerre_kernel = _laguerre_table
+
 
 class HydrogenAtomSolver(BaseSolver):
     def __init__(self):
@@ -62,59 +109,68 @@ class HydrogenAtomSolver(BaseSolver):
             if max_n > 8:
                 return {'valid': False, 'message': 'Maximum n should not exceed 8!'}
                 
-            return {'valid': True, 'message': 'Parameters valid'}
+            return {'valid': True, 'message': 'Parameters valid',
+                    'params': {'max_n': max_n, 'Z': Z, 'a0': a0, 'Ry': Ry}}
             
         except (ValueError, TypeError):
             return {'valid': False, 'message': 'Invalid parameter values!'}
     
     def solve(self, params):
-        max_n = int(params['max_n'])
-        Z = float(params['Z'])
-        a0 = float(params['a0'])
-        Ry = float(params['Ry'])
+        return self.solve_batch([params])[0]
+    
+    def solve_batch(self, param_list):
+        """Solve several hydrogen-like atoms at once with broadcast array operations"""
+        max_n = [p['max_n'] for p in param_list]
+        Z = np.array([p['Z'] for p in param_list])
+        a0 = np.array([p['a0'] for p in param_list])
+        Ry = np.array([p['Ry'] for p in param_list])
         
-        energy_levels = []
+        # Energy levels up to the largest requested n, one row per atom
+        n_values = np.arange(1, max(max_n, default=0) + 1)
+        energies = (-Ry * Z**2)[:, None] / n_values**2
         
-        for n in range(1, max_n + 1):
-            # Energy levels
-            energy = -Ry * Z**2 / n**2
-            
-            # Degeneracy
-            degeneracy = n**2
-            
-            # Orbital details
-            orbitals = []
-            for l in range(n):
-                orbital_name = self.get_orbital_name(n, l)
-                for m in range(-l, l + 1):
-                    orbitals.append({
-                        'n': n,
-                        'l': l,
-                        'm': m,
-                        'orbital': orbital_name
-                    })
-            
-            energy_levels.append({
-                'n': n,
-                'energy': round(energy, 4),
-                'degeneracy': degeneracy,
-                'orbitals': orbitals
-            })
+        # Orbital details only depend on n, so list them once for the batch
+        orbitals = {n: self.get_orbitals(n) for n in n_values.tolist()}
         
         # System properties
         ionization_energy = Ry * Z**2
         ground_state_radius = a0 / Z
         
-        return {
-            'system_info': {
-                'nuclear_charge': Z,
-                'bohr_radius': round(a0, 4),
-                'rydberg_energy': round(Ry, 4),
-                'ionization_energy': round(ionization_energy, 4),
-                'ground_state_radius': round(ground_state_radius, 4)
-            },
-            'energy_levels': energy_levels
-        }
+        results = []
+        for i, n_max in enumerate(max_n):
+            energy_levels = [{
+                'n': n,
+                'energy': round(energies[i, n - 1], 4),
+                'degeneracy': n**2,
+                'orbitals': orbitals[n]
+            } for n in range(1, n_max + 1)]
+            
+            results.append({
+                'system_info': {
+                    'nuclear_charge': float(Z[i]),
+                    'bohr_radius': round(a0[i], 4),
+                    'rydberg_energy': round(Ry[i], 4),
+                    'ionization_energy': round(ionization_energy[i], 4),
+                    'ground_state_radius': round(ground_state_radius[i], 4)
+                },
+                'energy_levels': energy_levels
+            })
+        
+        return results
+    
+    def get_orbitals(self, n):
+        """List every (n, l, m) orbital of a shell"""
+        orbitals = []
+        for l in range(n):
+            orbital_name = self.get_orbital_name(n, l)
+            for m in range(-l, l + 1):
+                orbitals.append({
+                    'n': n,
+                    'l': l,
+                    'm': m,
+                    'orbital': orbital_name
+                })
+        return orbitals
     
     def get_orbital_name(self, n, l):
         """Convert quantum numbers to orbital names"""
@@ -122,15 +178,15 @@ class HydrogenAtomSolver(BaseSolver):
         return f"{n}{l_names.get(l, '?')}"
     
     def generate_plot(self, params, results):
-        max_n = int(params['max_n'])
-        Z = float(params['Z'])
-        a0 = float(params['a0'])
-        Ry = float(params['Ry'])
+        max_n = params['max_n']
+        Z = params['Z']
+        a0 = params['a0']
+        Ry = params['Ry']
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+        fig, (ax1, ax2) = self.get_figure(1, 2, figsize=(15, 6))
         
         # Plot 1: Energy Level Diagram
-        colors = plt.cm.viridis(np.linspace(0, 1, max_n))
+        colors = VIRIDIS_COLORS[max_n]
         
         for i, level in enumerate(results['energy_levels']):
             n = level['n']
@@ -170,20 +226,23 @@ class HydrogenAtomSolver(BaseSolver):
         ax2.legend()
         ax2.grid(True, alpha=0.3)
         
-        plt.tight_layout()
+        fig.tight_layout()
         return self.plot_to_base64(fig)
     
     def radial_wavefunction(self, r, n, l, Z, a0):
         """Calculate radial wavefunction R_nl(r)"""
+        if (n, l) in _R_ANALYTIC:
+            return _R_ANALYTIC[(n, l)](r, Z, a0)
+        
         rho = 2 * Z * r / (n * a0)
         
         # Normalization constant
         norm = (2 * Z / (n * a0))**(3/2) * np.sqrt(
-            factorial(n - l - 1) / (2 * n * factorial(n + l))
+            _FACTORIALS[n - l - 1] / (2 * n * _FACTORIALS[n + l])
         )
         
         # Associated Laguerre polynomial
-        L = assoc_laguerre(rho, n - l - 1, 2*l + 1)
+        L = _laguerre_kernel(rho, n - l - 1, 2*l + 1)[n - l - 1]
         
         # Radial wavefunction
         R_nl = norm * np.exp(-rho/2) * (rho**l) * L
@@ -1,6 +1,27 @@
-from . import BaseSolver
+from . import BaseSolver, VIRIDIS_COLORS, parse_bool
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+import functools
+import math
+
+
+@functools.lru_cache(maxsize=64)
+def _grid(L, N=400):
+    """Plot grid across the box, shared between calls with the same L"""
+    x = np.linspace(0, L, N)
+    x.flags.writeable = False
+    return x
+
+
+@functools.lru_cache(maxsize=64)
+def _sin_table(L, max_n=4, N=400):
+    """Rows sin(nπx/L), n = 1..max_n, on _grid(L, N), shared between calls with the same L"""
+    # All harmonics in one ufunc call over the (max_n, N) phase table
+    table = np.sin(np.multiply.outer(np.arange(1, max_n + 1), (math.pi / L) * _grid(L, N)))
+    table.flags.writeable = False
+    return table
+
 
 class ParticleBoxSolver(BaseSolver):
     def __init__(self):
@@ -52,6 +73,13 @@ class ParticleBoxSolver(BaseSolver):
                 'default': True,
                 'unit': 'comparison',
                 'description': 'Show classical probability distribution'
+            },
+            'render_plot': {
+                'name': 'Render Plot',
+                'type': 'bool',
+                'default': True,
+                'unit': 'output',
+                'description': 'Generate the visualization (off returns numbers only)'
             }
         }
     
@@ -61,6 +89,8 @@ class ParticleBoxSolver(BaseSolver):
             m = float(params.get('m', 1.0))
             hbar = float(params.get('hbar', 1.0))
             max_n = int(params.get('max_n', 5))
+            show_classical = parse_bool(params.get('show_classical', True))
+            render_plot = parse_bool(params.get('render_plot', True))
             
             if any(x <= 0 for x in [L, m, hbar, max_n]):
                 return {'valid': False, 'message': 'All parameters must be positive!'}
@@ -68,37 +98,41 @@ class ParticleBoxSolver(BaseSolver):
             if max_n > 15:
                 return {'valid': False, 'message': 'Maximum n should not exceed 15!'}
                 
-            return {'valid': True, 'message': 'Parameters valid'}
+            return {'valid': True, 'message': 'Parameters valid',
+                    'params': {'box_length': L, 'm': m, 'hbar': hbar, 'max_n': max_n,
+                               'show_classical': show_classical, 'render_plot': render_plot}}
             
         except (ValueError, TypeError):
             return {'valid': False, 'message': 'Invalid parameter values!'}
     
     def solve(self, params):
-        L = float(params['box_length'])
-        m = float(params['m'])
-        hbar = float(params['hbar'])
-        max_n = int(params['max_n'])
+        L = params['box_length']
+        m = params['m']
+        hbar = params['hbar']
+        max_n = params['max_n']
+        
+        # Ground state energy sets the scale, E_n = n² E_1
+        E1 = math.pi * math.pi * hbar * hbar / (2.0 * m * L * L)
         
         # Energy levels
-        energy_levels = []
-        for n in range(1, max_n + 1):
-            energy = n**2 * np.pi**2 * hbar**2 / (2 * m * L**2)
-            wavelength = 2 * L / n  # de Broglie wavelength in the box
-            
-            energy_levels.append({
-                'n': n,
-                'energy': round(energy, 6),
-                'energy_ratio': round(energy / (np.pi**2 * hbar**2 / (2 * m * L**2)), 2),
-                'wavelength': round(wavelength, 4),
-                'nodes': n - 1  # Number of nodes (excluding boundaries)
-            })
+        ns = np.arange(1, max_n + 1, dtype=np.int64)
+        energies = np.round((ns * ns).astype(np.float64) * E1, 6)
+        wavelengths = np.round(2.0 * L / ns, 4)  # de Broglie wavelength in the box
+        
+        energy_levels = [{
+            'n': int(n),
+            'energy': float(energy),
+            'energy_ratio': float(n * n),
+            'wavelength': float(wavelength),
+            'nodes': int(n) - 1  # Number of nodes (excluding boundaries)
+        } for n, energy, wavelength in zip(ns, energies, wavelengths)]
         
         # Ground state properties
-        ground_state_energy = np.pi**2 * hbar**2 / (2 * m * L**2)
+        ground_state_energy = E1
         
         # Zero-point motion
-        ground_state_momentum = np.pi * hbar / L
-        uncertainty_product = (L / np.sqrt(12)) * ground_state_momentum  # Δx * Δp
+        ground_state_momentum = math.pi * hbar / L
+        uncertainty_product = (L / math.sqrt(12)) * ground_state_momentum  # Δx * Δp
         
         return {
             'system_info': {
@@ -112,56 +146,61 @@ class ParticleBoxSolver(BaseSolver):
         }
     
     def generate_plot(self, params, results):
-        L = float(params['box_length'])
-        m = float(params['m'])
-        hbar = float(params['hbar'])
-        max_n = int(params['max_n'])
-        show_classical = params.get('show_classical', True)
+        if not params.get('render_plot', True):
+            return None
         
-        fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 10))
+        L = params['box_length']
+        m = params['m']
+        hbar = params['hbar']
+        max_n = params['max_n']
+        show_classical = params['show_classical']
         
-        x = np.linspace(0, L, 1000)
+        fig, (ax1, ax2, ax3) = self.get_figure(3, 1, figsize=(12, 10))
+        
+        x = _grid(L)
+        n_shown = min(4, max_n)  # wavefunctions and densities are drawn for the first 4 levels
+        sins = _sin_table(L)[:n_shown]
+        energies = np.array([level['energy'] for level in results['energy_levels']])
+        
+        # Each plot draws its levels/curves as one collection, so the legends are
+        # built from unattached proxy lines, at a fixed position since loc='best'
+        # does not avoid collection paths
         
         # Plot 1: Energy level diagram
-        colors = plt.cm.viridis(np.linspace(0, 1, max_n))
+        colors = VIRIDIS_COLORS[max_n]
+        
+        # Energy levels, spanning the full x range set below
+        ax1.hlines(energies, -0.1*L, 1.3*L, colors=colors, linewidth=2)
+        level_handles = [Line2D([], [], color=colors[i], linewidth=2,
+                                label=f"n={level['n']}, E={level['energy']:.3f}")
+                         for i, level in enumerate(results['energy_levels'])]
         
+        # Energy level annotations
         for i, level in enumerate(results['energy_levels']):
-            n = level['n']
-            energy = level['energy']
-            
-            # Energy level
-            ax1.axhline(y=energy, color=colors[i], linewidth=2, 
-                       label=f'n={n}, E={energy:.3f}')
-            
-            # Energy level annotation
-            ax1.text(L*1.02, energy, f'n={n}', verticalalignment='center', 
+            ax1.text(L*1.02, level['energy'], f"n={level['n']}", verticalalignment='center', 
                     color=colors[i], fontweight='bold')
         
         # Potential walls
-        ax1.axvline(x=0, color='black', linewidth=4, alpha=0.8, label='Infinite Walls')
+        walls = ax1.axvline(x=0, color='black', linewidth=4, alpha=0.8, label='Infinite Walls')
         ax1.axvline(x=L, color='black', linewidth=4, alpha=0.8)
         
         ax1.set_xlim(-0.1*L, 1.3*L)
-        ax1.set_ylim(0, results['energy_levels'][-1]['energy'] * 1.1)
+        ax1.set_ylim(0, energies[-1] * 1.1)
         ax1.set_xlabel('Position')
         ax1.set_ylabel('Energy')
         ax1.set_title('Particle in a Box: Energy Levels')
-        ax1.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+        ax1.legend(handles=level_handles + [walls], bbox_to_anchor=(1.05, 1), loc='upper left')
         ax1.grid(True, alpha=0.3)
         
         # Plot 2: Wavefunctions
-        for i in range(min(4, max_n)):  # Show first 4 wavefunctions
-            n = i + 1
-            energy = results['energy_levels'][i]['energy']
-            
-            # Normalized wavefunction
-            psi = np.sqrt(2/L) * np.sin(n * np.pi * x / L)
-            
-            # Shift wavefunction to energy level
-            psi_shifted = energy + psi * (results['energy_levels'][-1]['energy'] * 0.15)
-            
-            ax2.plot(x, psi_shifted, color=colors[i], linewidth=2, label=f'ψ_{n}(x)')
-            ax2.axhline(y=energy, color=colors[i], linestyle='--', alpha=0.5)
+        # Normalized wavefunctions, shifted to their energy levels
+        curves = np.empty((n_shown, x.size, 2))
+        curves[:, :, 0] = x
+        curves[:, :, 1] = energies[:n_shown, None] + sins * (math.sqrt(2/L) * energies[-1] * 0.15)
+        ax2.add_collection(LineCollection(curves, colors=colors[:n_shown], linewidths=2))
+        ax2.autoscale_view()  # add_collection only updates the data limits
+        ax2.hlines(energies[:n_shown], -0.05*L, 1.05*L, colors=colors[:n_shown],
+                   linestyles='--', alpha=0.5)
         
         # Potential walls
         ax2.axvline(x=0, color='black', linewidth=4, alpha=0.8)
@@ -171,24 +210,25 @@ class ParticleBoxSolver(BaseSolver):
         ax2.set_xlabel('Position')
         ax2.set_ylabel('Energy + ψ(x)')
         ax2.set_title('Wavefunctions')
-        ax2.legend()
+        ax2.legend(handles=[Line2D([], [], color=colors[i], linewidth=2, label=f'ψ_{i + 1}(x)')
+                            for i in range(n_shown)], loc='upper right')
         ax2.grid(True, alpha=0.3)
         
         # Plot 3: Probability densities
-        for i in range(min(4, max_n)):  # Show first 4 probability densities
-            n = i + 1
-            
-            # Probability density
-            prob_density = (2/L) * np.sin(n * np.pi * x / L)**2
-            
-            ax3.plot(x, prob_density, color=colors[i], linewidth=2, 
-                    label=f'|ψ_{n}(x)|²', alpha=0.8)
+        densities = np.empty((n_shown, x.size, 2))
+        densities[:, :, 0] = x
+        densities[:, :, 1] = (2/L) * sins * sins
+        ax3.add_collection(LineCollection(densities, colors=colors[:n_shown], linewidths=2,
+                                          alpha=0.8))
+        ax3.autoscale_view()
+        density_handles = [Line2D([], [], color=colors[i], linewidth=2, alpha=0.8,
+                                  label=f'|ψ_{i + 1}(x)|²') for i in range(n_shown)]
         
         # Classical probability (uniform)
         if show_classical:
             classical_prob = np.ones_like(x) / L
-            ax3.plot(x, classical_prob, 'k--', linewidth=2, alpha=0.5, 
-                    label='Classical (uniform)')
+            density_handles += ax3.plot(x, classical_prob, 'k--', linewidth=2, alpha=0.5, 
+                                        label='Classical (uniform)')
         
         # Potential walls
         ax3.axvline(x=0, color='black', linewidth=4, alpha=0.8)
@@ -198,10 +238,10 @@ class ParticleBoxSolver(BaseSolver):
         ax3.set_xlabel('Position')
         ax3.set_ylabel('Probability Density')
         ax3.set_title('Quantum vs Classical Probability Distributions')
-        ax3.legend()
+        ax3.legend(handles=density_handles, loc='upper right')
         ax3.grid(True, alpha=0.3)
         
-        plt.tight_layout()
+        fig.tight_layout()
         return self.plot_to_base64(fig)
     
     def get_examples(self):
@@ -1,6 +1,94 @@
-from . import BaseSolver
+from . import BaseSolver, parse_bool
 import numpy as np
-import matplotlib.pyplot as plt
+import cmath
+import functools
+import math
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+@functools.lru_cache(maxsize=64)
+def _grid(a, N):
+    """Plot grid from -2a to 3a, shared between calls with the same a"""
+    x = np.linspace(-2*a, 3*a, N)
+    x.flags.writeable = False
+    return x
+
+
+def _build_psi(x_wave, i0, i1, k1, k2, a, R, T, tunneling):
+    """Piecewise scattering wavefunction on a sorted grid split at indices i0, i1"""
+    # x_wave is sorted, so the regions x < 0, 0 ≤ x ≤ a and x > a are contiguous
+    x1, x2, x3 = x_wave[:i0], x_wave[i0:i1], x_wave[i1:]
+    psi = np.empty_like(x_wave, dtype=complex)
+    psi1, psi2, psi3 = psi[:i0], psi[i0:i1], psi[i1:]
+    
+    # Every ufunc below writes straight into psi's real/imaginary views, so no
+    # temporaries are allocated. e^{ik₁x} is built as cos + i·sin of a phase held
+    # in the real view.
+    
+    # Region 1: x < 0, incident + reflected e^{ik₁x} + √R e^{-ik₁x}
+    # = (1 + √R) cos(k₁x) + i (1 - √R) sin(k₁x)
+    sqrt_R = math.sqrt(R)
+    np.multiply(k1, x1, out=psi1.real)
+    np.sin(psi1.real, out=psi1.imag)
+    np.cos(psi1.real, out=psi1.real)
+    psi1.real *= 1 + sqrt_R
+    psi1.imag *= 1 - sqrt_R
+    
+    # Region 2: 0 ≤ x ≤ a, real-valued
+    region2, scratch = psi2.real, psi2.imag
+    if tunneling:
+        # Exponential decay, (1 + √R) cosh(k₂(x - a)) / cosh(k₂a) written with
+        # exponents ≤ 0 so thick barriers cannot overflow
+        A = (1 + sqrt_R) / (1 + math.exp(-2 * k2 * a))
+        np.multiply(-k2, x2, out=region2)
+        np.exp(region2, out=region2)
+        np.subtract(x2, 2*a, out=scratch)
+        scratch *= k2
+        np.exp(scratch, out=scratch)
+        region2 += scratch
+        region2 *= A
+    else:
+        # Simplified wavefunction inside barrier
+        np.multiply(k2, x2, out=region2)
+        np.cos(region2, out=region2)
+        region2 *= 1 + sqrt_R
+    scratch[...] = 0
+    
+    # Region 3: x > a (transmitted), √T e^{ik₁x}
+    np.multiply(k1, x3, out=psi3.real)
+    np.sin(psi3.real, out=psi3.imag)
+    np.cos(psi3.real, out=psi3.real)
+    psi3 *= math.sqrt(T)
+    return psi
+
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _psi_kernel(x_wave, i0, i1, k1, k2, a, R, T, tunneling):
+        """JIT-compiled _build_psi, one fused pass over the grid"""
+        psi = np.empty(x_wave.size, dtype=np.complex128)
+        sqrt_R = math.sqrt(R)
+        sqrt_T = math.sqrt(T)
+        A = (1.0 + sqrt_R) / (1.0 + math.exp(-2.0 * k2 * a))
+        for i in range(x_wave.size):
+            xi = x_wave[i]
+            if i < i0:
+                incident = cmath.exp(1j * k1 * xi)
+                psi[i] = incident + sqrt_R * incident.conjugate()
+            elif i < i1:
+                if tunneling:
+                    psi[i] = A * (math.exp(-k2 * xi) + math.exp(k2 * (xi - 2.0 * a)))
+                else:
+                    psi[i] = (1.0 + sqrt_R) * math.cos(k2 * xi)
+            else:
+                psi[i] = sqrt_T * cmath.exp(1j * k1 * xi)
+        return psi
+else:
+    _psi_kernel = _build_psi
 
 class TunnelingSolver(BaseSolver):
     def __init__(self):
@@ -54,6 +142,13 @@ class TunnelingSolver(BaseSolver):
                 'max': 10.0,
                 'unit': 'action units',
                 'description': 'Reduced Planck constant'
+            },
+            'render_plot': {
+                'name': 'Render Plot',
+                'type': 'bool',
+                'default': True,
+                'unit': 'output',
+                'description': 'Generate the visualization (off returns numbers only)'
             }
         }
     
@@ -64,46 +159,53 @@ class TunnelingSolver(BaseSolver):
             E = float(params.get('particle_energy', 1.0))
             m = float(params.get('m', 1.0))
             hbar = float(params.get('hbar', 1.0))
+            render_plot = parse_bool(params.get('render_plot', True))
             
             if any(x <= 0 for x in [V0, a, E, m, hbar]):
                 return {'valid': False, 'message': 'All parameters must be positive!'}
                 
-            return {'valid': True, 'message': 'Parameters valid'}
+            return {'valid': True, 'message': 'Parameters valid',
+                    'params': {'barrier_height': V0, 'barrier_width': a, 'particle_energy': E,
+                               'm': m, 'hbar': hbar, 'render_plot': render_plot}}
             
         except (ValueError, TypeError):
             return {'valid': False, 'message': 'Invalid parameter values!'}
     
     def solve(self, params):
-        V0 = float(params['barrier_height'])
-        a = float(params['barrier_width'])
-        E = float(params['particle_energy'])
-        m = float(params['m'])
-        hbar = float(params['hbar'])
+        V0 = params['barrier_height']
+        a = params['barrier_width']
+        E = params['particle_energy']
+        m = params['m']
+        hbar = params['hbar']
         
         # Wave numbers
-        k1 = np.sqrt(2 * m * E / hbar**2)  # Outside barrier
+        k1 = math.sqrt(2 * m * E / hbar**2)  # Outside barrier
         
         if E < V0:
             # Tunneling case
-            k2 = np.sqrt(2 * m * (V0 - E) / hbar**2)  # Inside barrier (imaginary momentum)
+            k2 = math.sqrt(2 * m * (V0 - E) / hbar**2)  # Inside barrier (imaginary momentum)
             regime = "Tunneling"
             
             # Transmission coefficient
             gamma = k2 * a
-            sinh_gamma = np.sinh(gamma)
-            cosh_gamma = np.cosh(gamma)
-            
-            denominator = cosh_gamma**2 + (V0**2 * sinh_gamma**2) / (4 * E * (V0 - E))
-            T = 1 / denominator
+            if gamma > 20:
+                # Thick barrier: sinh(γ) ≈ e^γ/2, evaluated without overflow
+                T = 16.0 * E * (V0 - E) / (V0 * V0) * math.exp(-2.0 * gamma)
+            else:
+                T = 1.0 / (1.0 + (V0 * math.sinh(gamma))**2 / (4.0 * E * (V0 - E)))
             
         else:
             # Over-barrier case
-            k2 = np.sqrt(2 * m * (E - V0) / hbar**2)  # Inside barrier
+            k2 = math.sqrt(2 * m * (E - V0) / hbar**2)  # Inside barrier
             regime = "Over-barrier"
             
             # Transmission coefficient
-            sin_term = np.sin(k2 * a)**2
-            denominator = 1 + (V0**2 * sin_term) / (4 * E * (E - V0))
+            if E == V0:
+                # sin²(k₂a) / (E - V0) → 2ma²/ℏ² as k₂ → 0
+                denominator = 1 + V0 * m * a**2 / (2 * hbar**2)
+            else:
+                sin_term = math.sin(k2 * a)**2
+                denominator = 1 + (V0**2 * sin_term) / (4 * E * (E - V0))
             T = 1 / denominator
         
         # Reflection coefficient
@@ -116,17 +218,17 @@ class TunnelingSolver(BaseSolver):
         if E < V0:
             penetration_depth = 1 / k2
         else:
-            penetration_depth = np.inf
+            penetration_depth = math.inf
         
         # De Broglie wavelength
-        lambda_db = 2 * np.pi * hbar / np.sqrt(2 * m * E)
+        lambda_db = 2 * math.pi * hbar / math.sqrt(2 * m * E)
         
         return {
             'system_info': {
                 'regime': regime,
                 'barrier_parameter': round(V0/E, 3),
                 'de_broglie_wavelength': round(lambda_db, 4),
-                'penetration_depth': round(penetration_depth, 4) if penetration_depth != np.inf else 'infinite',
+                'penetration_depth': round(penetration_depth, 4) if penetration_depth != math.inf else 'infinite',
                 'classical_turning_point': round(classical_turning, 4)
             },
             'tunneling_results': {
@@ -143,17 +245,21 @@ class TunnelingSolver(BaseSolver):
         }
     
     def generate_plot(self, params, results):
-        V0 = float(params['barrier_height'])
-        a = float(params['barrier_width'])
-        E = float(params['particle_energy'])
-        m = float(params['m'])
-        hbar = float(params['hbar'])
+        if not params.get('render_plot', True):
+            return None
+        
+        V0 = params['barrier_height']
+        a = params['barrier_width']
+        E = params['particle_energy']
+        m = params['m']
+        hbar = params['hbar']
         
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8))
+        fig, (ax1, ax2) = self.get_figure(2, 1, figsize=(12, 8))
         
         # Plot 1: Potential and Energy
-        x = np.linspace(-2*a, 3*a, 1000)
-        V = np.where((x >= 0) & (x <= a), V0, 0)
+        x = _grid(a, 1000)
+        V = np.zeros_like(x)
+        V[np.searchsorted(x, 0.0):np.searchsorted(x, a, side='right')] = V0
         
         ax1.fill_between(x, 0, V, alpha=0.3, color='red', label='Potential Barrier')
         ax1.axhline(y=E, color='blue', linestyle='--', linewidth=2, label=f'Particle Energy E={E}')
@@ -177,55 +283,24 @@ class TunnelingSolver(BaseSolver):
                 bbox=dict(boxstyle="round,pad=0.3", facecolor='lightgreen'))
         
         # Plot 2: Wavefunction
-        x_wave = np.linspace(-2*a, 3*a, 2000)
+        x_wave = _grid(a, 600)
+        
+        i0 = np.searchsorted(x_wave, 0.0)
+        i1 = np.searchsorted(x_wave, a, side='right')
         
         k1 = np.sqrt(2 * m * E / hbar**2)
         T = results['tunneling_results']['transmission_coefficient']
         R = results['tunneling_results']['reflection_coefficient']
         
-        if E < V0:
-            # Tunneling case
-            k2 = np.sqrt(2 * m * (V0 - E) / hbar**2)
-            
-            # Wavefunction components
-            psi = np.zeros_like(x_wave, dtype=complex)
-            
-            # Region 1: x < 0 (incident + reflected)
-            mask1 = x_wave < 0
-            psi[mask1] = np.exp(1j * k1 * x_wave[mask1]) + np.sqrt(R) * np.exp(-1j * k1 * x_wave[mask1])
-            
-            # Region 2: 0 < x < a (exponential decay)
-            mask2 = (x_wave >= 0) & (x_wave <= a)
-            A = (1 + np.sqrt(R)) * np.exp(k2 * a) / (np.exp(k2 * a) + np.exp(-k2 * a))
-            psi[mask2] = A * (np.exp(-k2 * x_wave[mask2]) + np.exp(k2 * (x_wave[mask2] - 2*a)))
-            
-            # Region 3: x > a (transmitted)
-            mask3 = x_wave > a
-            psi[mask3] = np.sqrt(T) * np.exp(1j * k1 * x_wave[mask3])
-            
-        else:
-            # Over-barrier case
-            k2 = np.sqrt(2 * m * (E - V0) / hbar**2)
-            
-            psi = np.zeros_like(x_wave, dtype=complex)
-            
-            # Region 1: x < 0
-            mask1 = x_wave < 0
-            psi[mask1] = np.exp(1j * k1 * x_wave[mask1]) + np.sqrt(R) * np.exp(-1j * k1 * x_wave[mask1])
-            
-            # Region 2: 0 < x < a
-            mask2 = (x_wave >= 0) & (x_wave <= a)
-            # Simplified wavefunction inside barrier
-            phase_shift = k1 * 0 - k2 * 0  # Approximate
-            psi[mask2] = (1 + np.sqrt(R)) * np.cos(k2 * x_wave[mask2] + phase_shift)
-            
-            # Region 3: x > a
-            mask3 = x_wave > a
-            psi[mask3] = np.sqrt(T) * np.exp(1j * k1 * x_wave[mask3])
+        # Inside barrier: decay constant when tunneling, wave number otherwise
+        k2 = np.sqrt(2 * m * abs(V0 - E) / hbar**2)
+        psi = _psi_kernel(x_wave, i0, i1, k1, k2, a, R, T, E < V0)
         
         # Plot real part and probability density
         ax2.plot(x_wave, np.real(psi), 'b-', linewidth=1.5, label='Re(ψ)', alpha=0.7)
-        ax2.plot(x_wave, np.abs(psi)**2, 'r-', linewidth=2, label='|ψ|²')
+        density = np.abs(psi)
+        np.multiply(density, density, out=density)
+        ax2.plot(x_wave, density, 'r-', linewidth=2, label='|ψ|²')
         
         # Shade barrier region
         ax2.axvspan(0, a, alpha=0.2, color='red')
@@ -237,7 +312,7 @@ class TunnelingSolver(BaseSolver):
         ax2.legend()
         ax2.grid(True, alpha=0.3)
         
-        plt.tight_layout()
+        fig.tight_layout()
         return self.plot_to_base64(fig)
     
     def get_examples(self):